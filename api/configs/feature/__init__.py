@@ -1044,6 +1044,11 @@ class WorkspaceConfig(BaseSettings):
         default=72,
     )
 
+    MAX_TENANT_TREE_NODES: PositiveInt = Field(
+        description="Maximum number of workspaces returned in a single workspace hierarchy",
+        default=10000,
+    )
+
 
 class IndexingConfig(BaseSettings):
     """
@@ -1,10 +1,10 @@
 import flask_restx
 from flask_restx import Resource, fields, marshal_with
 from flask_restx._http import HTTPStatus
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
 from werkzeug.exceptions import Forbidden
 
+from core.helper.api_token_cache import ApiTokenCache
 from extensions.ext_database import db
 from libs.helper import TimestampField
 from libs.login import current_account_with_tenant, login_required
@@ -32,18 +32,8 @@ api_key_list_model = console_ns.model(
 
 
 def _get_resource(resource_id, tenant_id, resource_model):
-    if resource_model == App:
-        with Session(db.engine) as session:
-            resource = session.execute(
-                select(resource_model).filter_by(id=resource_id, tenant_id=tenant_id)
-            ).scalar_one_or_none()
-    else:
-        with Session(db.engine) as session:
-            resource = session.execute(
-                select(resource_model).filter_by(id=resource_id, tenant_id=tenant_id)
-            ).scalar_one_or_none()
-
-    if resource is None:
+    resource = db.session.get(resource_model, resource_id)
+    if resource is None or resource.tenant_id != tenant_id:
         flask_restx.abort(HTTPStatus.NOT_FOUND, message=f"{resource_model.__name__} not found.")
 
     return resource
@@ -76,15 +66,27 @@ class BaseApiKeyListResource(Resource):
     @edit_permission_required
     def post(self, resource_id):
         assert self.resource_id_field is not None, "resource_id_field must be set"
+        assert self.resource_model is not None, "resource_model must be set"
         resource_id = str(resource_id)
         _, current_tenant_id = current_account_with_tenant()
-        _get_resource(resource_id, current_tenant_id, self.resource_model)
-        current_key_count = (
-            db.session.query(ApiToken)
+        # Lock the owning resource first so concurrent requests serialize on it; the count below runs as its
+        # own statement and therefore sees keys committed by whoever held the lock before us.
+        resource = db.session.execute(
+            select(self.resource_model)
+            .filter_by(id=resource_id, tenant_id=current_tenant_id)
+            .with_for_update()
+        ).scalar_one_or_none()
+        if resource is None:
+            flask_restx.abort(HTTPStatus.NOT_FOUND, message=f"{self.resource_model.__name__} not found.")
+
+        # Count at most max_keys rows; the gate only needs to know whether the limit is reached.
+        existing_keys = (
+            select(ApiToken.id)
             .where(ApiToken.type == self.resource_type, getattr(ApiToken, self.resource_id_field) == resource_id)
-            .count()
+            .limit(self.max_keys)
+            .subquery()
         )
-
+        current_key_count = db.session.scalar(select(func.count()).select_from(existing_keys)) or 0
         if current_key_count >= self.max_keys:
             flask_restx.abort(
                 HTTPStatus.BAD_REQUEST,
@@ -133,6 +135,7 @@ class BaseApiKeyResource(Resource):
 
         db.session.query(ApiToken).where(ApiToken.id == api_key_id).delete()
         db.session.commit()
+        ApiTokenCache.delete(key.token, self.resource_type)
 
         return {"result": "success"}, 204
 
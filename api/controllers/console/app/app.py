@@ -5,7 +5,7 @@ from flask import request
 from flask_restx import Resource, fields, marshal, marshal_with
 from pydantic import BaseModel, Field, field_validator
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from werkzeug.exceptions import BadRequest
 
 from controllers.console import console_ns
@@ -295,7 +295,10 @@ class AppListApi(Resource):
         if workflow_capable_app_ids:
             draft_workflows = (
                 db.session.execute(
-                    select(Workflow).where(
+                    select(Workflow)
+                    # Only the graph is needed to look for trigger nodes; skip the other large JSON columns.
+                    .options(load_only(Workflow.app_id, Workflow.graph))
+                    .where(
                         Workflow.version == Workflow.VERSION_DRAFT,
                         Workflow.app_id.in_(workflow_capable_app_ids),
                     )
@@ -1,10 +1,10 @@
 import logging
+from functools import lru_cache
 
 import httpx
-from flask import current_app, redirect, request
+from flask import redirect, request
 from flask_restx import Resource
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, insert, or_, select
 from werkzeug.exceptions import Unauthorized
 
 from configs import dify_config
@@ -19,7 +19,7 @@ from libs.token import (
     set_csrf_token_to_cookie,
     set_refresh_token_to_cookie,
 )
-from models import Account, AccountStatus
+from models import Account, AccountIntegrate, AccountStatus, TenantAccountRole
 from services.account_service import AccountService, RegisterService, TenantService
 from services.billing_service import BillingService
 from services.errors.account import AccountNotFoundError, AccountRegisterError
@@ -31,27 +31,27 @@ from .. import console_ns
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1)
 def get_oauth_providers():
-    with current_app.app_context():
-        if not dify_config.GITHUB_CLIENT_ID or not dify_config.GITHUB_CLIENT_SECRET:
-            github_oauth = None
-        else:
-            github_oauth = GitHubOAuth(
-                client_id=dify_config.GITHUB_CLIENT_ID,
-                client_secret=dify_config.GITHUB_CLIENT_SECRET,
-                redirect_uri=dify_config.CONSOLE_API_URL + "/console/api/oauth/authorize/github",
-            )
-        if not dify_config.CASDOOR_CLIENT_ID or not dify_config.CASDOOR_CLIENT_SECRET:
-            casdoor_oauth = None
-        else:
-            casdoor_oauth = CasdoorOAuth(
-                client_id=dify_config.CASDOOR_CLIENT_ID,
-                client_secret=dify_config.CASDOOR_CLIENT_SECRET,
-                redirect_uri=dify_config.CONSOLE_API_URL + "/console/api/oauth/authorize/casdoor",
-            )
+    if not dify_config.GITHUB_CLIENT_ID or not dify_config.GITHUB_CLIENT_SECRET:
+        github_oauth = None
+    else:
+        github_oauth = GitHubOAuth(
+            client_id=dify_config.GITHUB_CLIENT_ID,
+            client_secret=dify_config.GITHUB_CLIENT_SECRET,
+            redirect_uri=dify_config.CONSOLE_API_URL + "/console/api/oauth/authorize/github",
+        )
+    if not dify_config.CASDOOR_CLIENT_ID or not dify_config.CASDOOR_CLIENT_SECRET:
+        casdoor_oauth = None
+    else:
+        casdoor_oauth = CasdoorOAuth(
+            client_id=dify_config.CASDOOR_CLIENT_ID,
+            client_secret=dify_config.CASDOOR_CLIENT_SECRET,
+            redirect_uri=dify_config.CONSOLE_API_URL + "/console/api/oauth/authorize/casdoor",
+        )
 
-        OAUTH_PROVIDERS = {"github": github_oauth, "casdoor": casdoor_oauth}
-        return OAUTH_PROVIDERS
+    OAUTH_PROVIDERS = {"github": github_oauth, "casdoor": casdoor_oauth}
+    return OAUTH_PROVIDERS
 
 
 @console_ns.route("/oauth/login/<provider>")
@@ -65,9 +65,7 @@ class OAuthLogin(Resource):
     @console_ns.response(400, "Invalid provider")
     def get(self, provider: str):
         invite_token = request.args.get("invite_token") or None
-        OAUTH_PROVIDERS = get_oauth_providers()
-        with current_app.app_context():
-            oauth_provider = OAUTH_PROVIDERS.get(provider)
+        oauth_provider = get_oauth_providers().get(provider)
         if not oauth_provider:
             return {"error": "Invalid provider"}, 400
 
@@ -89,9 +87,7 @@ class OAuthCallback(Resource):
     @console_ns.response(302, "Redirect to console with access token")
     @console_ns.response(400, "OAuth process failed")
     def get(self, provider: str):
-        OAUTH_PROVIDERS = get_oauth_providers()
-        with current_app.app_context():
-            oauth_provider = OAUTH_PROVIDERS.get(provider)
+        oauth_provider = get_oauth_providers().get(provider)
         if not oauth_provider:
             return {"error": "Invalid provider"}, 400
 
@@ -168,165 +164,144 @@ class OAuthCallback(Resource):
 
 
 def _get_account_by_openid_or_email(provider: str, user_info: OAuthUserInfo) -> Account | None:
-    account: Account | None = Account.get_by_openid(provider, user_info.id)
+    # One round trip: prefer the account linked to this provider identity, then fall back to the email match.
+    stmt = (
+        select(Account)
+        .outerjoin(
+            AccountIntegrate,
+            and_(
+                AccountIntegrate.account_id == Account.id,
+                AccountIntegrate.provider == provider,
+                AccountIntegrate.open_id == user_info.id,
+            ),
+        )
+        .where(or_(AccountIntegrate.id.is_not(None), Account.email == user_info.email))
+        .order_by(AccountIntegrate.id.is_(None))
+        .limit(1)
+    )
+    return db.session.execute(stmt).scalar_one_or_none()
 
-    if not account:
-        with Session(db.engine) as session:
-            account = session.execute(select(Account).filter_by(email=user_info.email)).scalar_one_or_none()
 
-    return account
+def _expand_org_paths(organizations: list) -> list[str]:
+    """展开组织路径的所有层级并去重，父级总是排在子级之前
+
+    例如 "Yrec/eng-backend" 展开为 ["Yrec", "Yrec/eng", "Yrec/eng-backend"]
+    """
+    paths: list[str] = []
+    for org in organizations:
+        if not org or not isinstance(org, str):
+            continue
+        if "/" not in org:
+            paths.append(org)
+            continue
+        root_org, child_org_part = org.split("/", 1)
+        org_path_parts = child_org_part.split("-")
+        paths.append(root_org)
+        paths.extend(f"{root_org}/{'-'.join(org_path_parts[: i + 1])}" for i in range(len(org_path_parts)))
+    return list(dict.fromkeys(paths))
+
+
+def _split_org_path(org_path: str) -> tuple[str, str | None]:
+    """返回组织路径对应的工作空间名称和父级路径"""
+    if "/" not in org_path:
+        return org_path, None
+    root_org, child_org_part = org_path.split("/", 1)
+    parent_parts, _, name = child_org_part.rpartition("-")
+    return name, f"{root_org}/{parent_parts}" if parent_parts else root_org
 
 
 def _sync_user_organizations(account: Account, user_info: OAuthUserInfo):
     """同步用户的Casdoor组织到Dify工作空间"""
-    from models.account import CasdoorOrganizationMapping, Tenant
-    
+    from models.account import CasdoorOrganizationMapping, Tenant, TenantAccountJoin
+
     # 仅处理Casdoor OAuth
     if not user_info.organizations:
         logging.info("No organizations to sync")
         return
-    
-    # 获取现有组织映射
-    existing_mappings = db.session.query(CasdoorOrganizationMapping).all()
-    org_to_tenant = {mapping.casdoor_org_id: mapping.tenant_id for mapping in existing_mappings}
-    tenant_to_org = {mapping.tenant_id: mapping.casdoor_org_id for mapping in existing_mappings}
-    
+
+    # 按层级顺序展开所有需要的组织路径
+    required_paths = _expand_org_paths(user_info.organizations)
+
     # 获取用户当前关联的工作空间
     user_tenants = TenantService.get_join_tenants(account)
-    user_tenant_ids = [tenant.id for tenant in user_tenants]
-    
-    # 处理每个组织
-    for org in user_info.organizations:
-        if not org:
-            continue
-        
-        # 处理字符串类型的组织（来自Casdoor）
-        if isinstance(org, str):
-            # 解析组织字符串，格式为 company/org-name-children
-            if '/' in org:
-                # 分割根组织和子组织部分
-                root_org, child_org_part = org.split('/', 1)
-                
-                # 解析完整的组织路径，处理通过"-"分隔的层级
-                org_path_parts = child_org_part.split('-')
-                
-                # 处理根组织（Yrec）
-                root_casdoor_org_id = f"{root_org}"
-                if root_casdoor_org_id not in org_to_tenant:
-                    # 创建根工作空间
-                    root_tenant = Tenant(
-                        name=root_org,
-                        casdoor_org_id=root_casdoor_org_id,
-                        parent_id=None,
-                        plan="basic",
-                        status="normal"
-                    )
-                    db.session.add(root_tenant)
-                    db.session.flush()
-                    
-                    # 创建映射关系
-                    root_mapping = CasdoorOrganizationMapping(
-                        casdoor_org_id=root_casdoor_org_id,
-                        tenant_id=root_tenant.id
-                    )
-                    db.session.add(root_mapping)
-                    
-                    # 更新映射关系
-                    org_to_tenant[root_casdoor_org_id] = root_tenant.id
-                    tenant_to_org[root_tenant.id] = root_casdoor_org_id
-                
-                current_parent_tenant_id = org_to_tenant[root_casdoor_org_id]
-                
-                # 保存所有层级的工作空间ID，用于后续添加用户
-                all_level_tenant_ids = [org_to_tenant[root_casdoor_org_id]]
-                
-                # 处理中间层级
-                for i, part in enumerate(org_path_parts):
-                    # 构建当前层级的完整路径和名称
-                    current_org_name = part
-                    full_org_path = f"{root_org}/{'-'.join(org_path_parts[:i+1])}"
-                    
-                    # 创建当前层级的工作空间
-                    if full_org_path not in org_to_tenant:
-                        new_tenant = Tenant(
-                            name=current_org_name,
-                            casdoor_org_id=full_org_path,
-                            parent_id=current_parent_tenant_id,
-                            plan="basic",
-                            status="normal"
-                        )
-                        db.session.add(new_tenant)
-                        db.session.flush()
-                        
-                        # 创建映射关系
-                        mapping = CasdoorOrganizationMapping(
-                            casdoor_org_id=full_org_path,
-                            tenant_id=new_tenant.id
-                        )
-                        db.session.add(mapping)
-                        
-                        # 更新映射关系
-                        org_to_tenant[full_org_path] = new_tenant.id
-                        tenant_to_org[new_tenant.id] = full_org_path
-                    
-                    # 添加当前层级的工作空间ID到列表
-                    current_tenant_id = org_to_tenant[full_org_path]
-                    all_level_tenant_ids.append(current_tenant_id)
-                    
-                    # 更新当前父级信息，用于下一层级
-                    current_parent_tenant_id = current_tenant_id
-                
-                # 确保用户关联到所有层级的工作空间
-                for tenant_id in all_level_tenant_ids:
-                    if tenant_id not in user_tenant_ids:
-                        tenant = db.session.query(Tenant).filter_by(id=tenant_id).first()
-                        if tenant:
-                            TenantService.create_tenant_member(tenant, account, role="admin")
-                            user_tenant_ids.append(tenant_id)
-            else:
-                # 处理没有"/"的情况（简单组织）
-                casdoor_org_id = org
-                org_name = org
-                
-                if casdoor_org_id not in org_to_tenant:
-                    # 创建新工作空间
-                    new_tenant = Tenant(
-                        name=org_name,
-                        casdoor_org_id=casdoor_org_id,
-                        parent_id=None,
-                        plan="basic",
-                        status="normal"
-                    )
-                    db.session.add(new_tenant)
-                    db.session.flush()
-                    
-                    # 创建映射关系
-                    mapping = CasdoorOrganizationMapping(
-                        casdoor_org_id=casdoor_org_id,
-                        tenant_id=new_tenant.id
-                    )
-                    db.session.add(mapping)
-                    
-                    # 更新映射关系
-                    org_to_tenant[casdoor_org_id] = new_tenant.id
-                    tenant_to_org[new_tenant.id] = casdoor_org_id
-                
-                # 确保用户关联到工作空间
-                tenant_id = org_to_tenant[casdoor_org_id]
-                if tenant_id not in user_tenant_ids:
-                    tenant = db.session.query(Tenant).filter_by(id=tenant_id).first()
-                    if tenant:
-                        TenantService.create_tenant_member(tenant, account, role="admin")
-                        user_tenant_ids.append(tenant_id)
+    tenants_by_id: dict[str, Tenant] = {tenant.id: tenant for tenant in user_tenants}
+    # get_join_tenants 只返回正常状态的工作空间; 已有成员关系需不区分状态, 否则批量插入会触发唯一约束
+    user_tenant_ids: set[str] = set(
+        db.session.scalars(select(TenantAccountJoin.tenant_id).where(TenantAccountJoin.account_id == account.id))
+    )
 
-    # 如果用户没有当前工作空间，设置第一个组织作为当前工作空间
-    if not account.current_tenant and user_tenant_ids:
-        first_tenant = db.session.query(Tenant).filter_by(id=user_tenant_ids[0]).first()
-        if first_tenant:
-            account.current_tenant = first_tenant
-    
+    # 只加载相关的组织映射，并同时取回对应的工作空间
+    org_to_tenant: dict[str, str] = {}
+    if required_paths:
+        rows = db.session.execute(
+            select(CasdoorOrganizationMapping, Tenant)
+            .outerjoin(Tenant, CasdoorOrganizationMapping.tenant_id == Tenant.id)
+            .where(CasdoorOrganizationMapping.casdoor_org_id.in_(required_paths))
+        ).all()
+        for mapping, tenant in rows:
+            org_to_tenant[mapping.casdoor_org_id] = mapping.tenant_id
+            if tenant:
+                tenants_by_id[tenant.id] = tenant
+
+    # 新建的工作空间和映射在遍历结束后统一写入
+    new_tenants: list[Tenant] = []
+    new_mappings: list[CasdoorOrganizationMapping] = []
+    # 需要关联用户的工作空间ID，保持遍历顺序
+    member_tenant_ids: list[str] = []
+
+    # 父级路径总在子级之前，创建子级时父级工作空间一定已存在
+    for org_path in required_paths:
+        tenant_id = org_to_tenant.get(org_path)
+        if not tenant_id:
+            name, parent_path = _split_org_path(org_path)
+            # Tenant ID 在客户端生成，无需 flush 即可用于子级和映射
+            tenant = Tenant(
+                name=name,
+                casdoor_org_id=org_path,
+                parent_id=org_to_tenant[parent_path] if parent_path else None,
+                plan="basic",
+                status="normal",
+            )
+            new_tenants.append(tenant)
+            new_mappings.append(CasdoorOrganizationMapping(casdoor_org_id=org_path, tenant_id=tenant.id))
+            org_to_tenant[org_path] = tenant_id = tenant.id
+            tenants_by_id[tenant_id] = tenant
+
+        # 确保用户关联到所有层级的工作空间
+        if tenant_id not in user_tenant_ids:
+            user_tenant_ids.add(tenant_id)
+            member_tenant_ids.append(tenant_id)
+
+    # 一次性写入所有新建的工作空间及其映射
+    if new_tenants:
+        db.session.add_all(new_tenants)
+        db.session.add_all(new_mappings)
+        db.session.flush()
+
+    # 批量将用户加入所有缺失的工作空间
+    missing_tenant_ids = [tenant_id for tenant_id in member_tenant_ids if tenant_id in tenants_by_id]
+    if missing_tenant_ids:
+        db.session.execute(
+            insert(TenantAccountJoin),
+            [
+                {"tenant_id": tenant_id, "account_id": account.id, "role": TenantAccountRole.ADMIN}
+                for tenant_id in missing_tenant_ids
+            ],
+        )
+        if dify_config.BILLING_ENABLED:
+            for tenant_id in missing_tenant_ids:
+                BillingService.clean_billing_info_cache(tenant_id)
+
+    # current_tenant 的 setter 使用独立会话读取，必须先提交新建的工作空间和成员关系
     db.session.commit()
 
+    # 如果用户没有当前工作空间，设置第一个组织作为当前工作空间
+    if not account.current_tenant:
+        if user_tenants:
+            account.current_tenant = user_tenants[0]
+        elif missing_tenant_ids:
+            account.current_tenant = tenants_by_id[missing_tenant_ids[0]]
+
 
 def _generate_account(provider: str, user_info: OAuthUserInfo):
     # Get account by openid or email.
@@ -355,23 +330,21 @@ def _generate_account(provider: str, user_info: OAuthUserInfo):
             else:
                 raise AccountRegisterError(description=("Invalid email or password"))
         account_name = user_info.name or "Dify"
+        # Registration stores the interface language and links the provider identity in its own commit
         account = RegisterService.register(
-            email=user_info.email, name=account_name, password=None, open_id=user_info.id, provider=provider
+            email=user_info.email,
+            name=account_name,
+            password=None,
+            open_id=user_info.id,
+            provider=provider,
+            language=request.accept_languages.best_match(languages),
         )
+    else:
+        # Link account
+        AccountService.link_account_integrate(provider, user_info.id, account)
 
-        # Set interface language
-        preferred_lang = request.accept_languages.best_match(languages)
-        if preferred_lang and preferred_lang in languages:
-            interface_language = preferred_lang
-        else:
-            interface_language = languages[0]
-        account.interface_language = interface_language
-        db.session.commit()
-
-    # Link account
-    AccountService.link_account_integrate(provider, user_info.id, account)
-    
-    # Sync user organizations from Casdoor
-    _sync_user_organizations(account, user_info)
+    # Sync user organizations from Casdoor; other providers never report any
+    if user_info.organizations:
+        _sync_user_organizations(account, user_info)
 
     return account
@@ -24,6 +24,7 @@ from controllers.console.wraps import (
     setup_required,
 )
 from core.errors.error import LLMBadRequestError, ProviderTokenNotInitError
+from core.helper.api_token_cache import ApiTokenCache
 from core.indexing_runner import IndexingRunner
 from core.model_runtime.entities.model_entities import ModelType
 from core.provider_manager import ProviderManager
@@ -794,6 +795,7 @@ class DatasetApiDeleteApi(Resource):
 
         db.session.query(ApiToken).where(ApiToken.id == api_key_id).delete()
         db.session.commit()
+        ApiTokenCache.delete(key.token, self.resource_type)
 
         return {"result": "success"}, 204
 
@@ -1,7 +1,9 @@
 import io
+from functools import lru_cache
 from urllib.parse import urlparse
 
-from flask import make_response, redirect, request, send_file
+import orjson
+from flask import Response, make_response, redirect, request, send_file
 from flask_restx import (
     Resource,
     reqparse,
@@ -303,13 +305,14 @@ class ToolApiProviderListToolsApi(Resource):
 
         args = parser_tools.parse_args()
 
-        return jsonable_encoder(
-            ApiToolManageService.list_api_tool_provider_tools(
+        return [
+            tool.model_dump(mode="json")
+            for tool in ApiToolManageService.list_api_tool_provider_tools(
                 user_id,
                 tenant_id,
                 args["provider"],
             )
-        )
+        ]
 
 
 parser_api_update = (
@@ -673,14 +676,10 @@ class ToolApiListApi(Resource):
     def get(self):
         _, tenant_id = current_account_with_tenant()
 
-        return jsonable_encoder(
-            [
-                provider.to_dict()
-                for provider in ApiToolManageService.list_api_tools(
-                    tenant_id,
-                )
-            ]
-        )
+        # to_dict() already yields JSON-safe primitives, so serialize directly instead of
+        # walking the payload again with jsonable_encoder
+        payload = orjson.dumps([provider.to_dict() for provider in ApiToolManageService.list_api_tools(tenant_id)])
+        return Response(payload, mimetype="application/json")
 
 
 @console_ns.route("/workspaces/current/tools/workflow")
@@ -704,6 +703,12 @@ class ToolWorkflowListApi(Resource):
         )
 
 
+@lru_cache(maxsize=1)
+def _encoded_tool_labels():
+    # Tool labels are a static list, so the encoded payload can be reused across requests
+    return jsonable_encoder(ToolLabelsService.list_tool_labels())
+
+
 @console_ns.route("/workspaces/current/tool-labels")
 class ToolLabelsApi(Resource):
     @setup_required
@@ -711,7 +716,7 @@ class ToolLabelsApi(Resource):
     @account_initialization_required
     @enterprise_license_required
     def get(self):
-        return jsonable_encoder(ToolLabelsService.list_tool_labels())
+        return _encoded_tool_labels()
 
 
 @console_ns.route("/oauth/plugin/<path:provider>/tool/authorization-url")
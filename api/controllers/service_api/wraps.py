@@ -14,6 +14,7 @@ from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 from werkzeug.exceptions import Forbidden, NotFound, Unauthorized
 
+from core.helper.api_token_cache import ApiTokenCache
 from enums.cloud_plan import CloudPlan
 from extensions.ext_database import db
 from extensions.ext_redis import redis_client
@@ -530,6 +531,10 @@ def validate_and_get_api_token(scope: str | None = None):
     if auth_scheme != "bearer":
         raise Unauthorized("Authorization scheme must be 'Bearer'")
 
+    cached_token = ApiTokenCache.get(auth_token, scope)
+    if cached_token:
+        return ApiToken(token=auth_token, **cached_token)
+
     current_time = naive_utc_now()
     cutoff_time = current_time - timedelta(minutes=1)
     with Session(db.engine, expire_on_commit=False) as session:
@@ -552,6 +557,11 @@ def validate_and_get_api_token(scope: str | None = None):
         if not api_token:
             raise Unauthorized("Access token is invalid")
 
+    ApiTokenCache.set(
+        auth_token,
+        scope,
+        {"id": api_token.id, "app_id": api_token.app_id, "tenant_id": api_token.tenant_id, "type": api_token.type},
+    )
     return api_token
 
 
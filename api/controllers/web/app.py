@@ -78,6 +78,13 @@ class AppMeta(WebApiResource):
         return AppService().get_app_meta(app_model)
 
 
+access_mode_parser = (
+    reqparse.RequestParser()
+    .add_argument("appId", type=str, required=False, location="args")
+    .add_argument("appCode", type=str, required=False, location="args")
+)
+
+
 @web_ns.route("/webapp/access-mode")
 class AppAccessMode(Resource):
     @web_ns.doc("Get App Access Mode")
@@ -96,12 +103,7 @@ class AppAccessMode(Resource):
         }
     )
     def get(self):
-        parser = (
-            reqparse.RequestParser()
-            .add_argument("appId", type=str, required=False, location="args")
-            .add_argument("appCode", type=str, required=False, location="args")
-        )
-        args = parser.parse_args()
+        args = access_mode_parser.parse_args()
 
         features = FeatureService.get_system_features()
         if not features.webapp_auth.enabled:
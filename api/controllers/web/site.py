@@ -98,10 +98,11 @@ class AppSiteInfo:
 
         if can_replace_logo:
             base_url = dify_config.FILES_URL
-            remove_webapp_brand = tenant.custom_config_dict.get("remove_webapp_brand", False)
+            custom_config = tenant.custom_config_dict
+            remove_webapp_brand = custom_config.get("remove_webapp_brand", False)
             replace_webapp_logo = (
                 f"{base_url}/files/workspaces/{tenant.id}/webapp-logo"
-                if tenant.custom_config_dict.get("replace_webapp_logo")
+                if custom_config.get("replace_webapp_logo")
                 else None
             )
             self.custom_config = {
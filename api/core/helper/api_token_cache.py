@@ -0,0 +1,47 @@
+import hashlib
+import json
+import logging
+from typing import Any
+
+from extensions.ext_redis import redis_client, redis_fallback
+
+logger = logging.getLogger(__name__)
+
+
+class ApiTokenCache:
+    """Cache for validated service API tokens"""
+
+    CACHE_TTL = 60  # 1 minute
+
+    @staticmethod
+    def _generate_cache_key(token: str, scope: str | None) -> str:
+        """Generate cache key for an API token, never storing the raw token in the key"""
+        token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        return f"api_token:{scope}:{token_hash}"
+
+    @staticmethod
+    @redis_fallback(default_return=None)
+    def get(token: str, scope: str | None) -> dict[str, Any] | None:
+        """Get cached API token fields"""
+        cache_key = ApiTokenCache._generate_cache_key(token, scope)
+        cached_data = redis_client.get(cache_key)
+        if cached_data:
+            try:
+                return json.loads(cached_data.decode("utf-8"))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                logger.warning("Failed to decode cached API token data")
+                return None
+        return None
+
+    @staticmethod
+    @redis_fallback()
+    def set(token: str, scope: str | None, data: dict[str, Any]):
+        """Cache API token fields"""
+        cache_key = ApiTokenCache._generate_cache_key(token, scope)
+        redis_client.setex(cache_key, ApiTokenCache.CACHE_TTL, json.dumps(data))
+
+    @staticmethod
+    @redis_fallback()
+    def delete(token: str, scope: str | None):
+        """Invalidate cached API token"""
+        redis_client.delete(ApiTokenCache._generate_cache_key(token, scope))
@@ -3,6 +3,15 @@ from dataclasses import dataclass, field
 
 import httpx
 
+from core.helper.http_client_pooling import get_pooled_http_client
+
+_OAUTH_HTTP_TIMEOUT = 10
+_OAUTH_CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=10, max_connections=50)
+
+
+def _build_oauth_client() -> httpx.Client:
+    return httpx.Client(timeout=_OAUTH_HTTP_TIMEOUT, limits=_OAUTH_CLIENT_LIMITS)
+
 
 @dataclass
 class OAuthUserInfo:
@@ -18,6 +27,11 @@ class OAuth:
         self.client_secret = client_secret
         self.redirect_uri = redirect_uri
 
+    @property
+    def _client(self) -> httpx.Client:
+        # One pooled client per provider so the token and user info calls share keep-alive connections.
+        return get_pooled_http_client(f"oauth:{type(self).__name__}", _build_oauth_client)
+
     def get_authorization_url(self):
         raise NotImplementedError()
 
@@ -59,7 +73,7 @@ class GitHubOAuth(OAuth):
             "redirect_uri": self.redirect_uri,
         }
         headers = {"Accept": "application/json"}
-        response = httpx.post(self._TOKEN_URL, data=data, headers=headers)
+        response = self._client.post(self._TOKEN_URL, data=data, headers=headers)
 
         response_json = response.json()
         access_token = response_json.get("access_token")
@@ -71,11 +85,11 @@ class GitHubOAuth(OAuth):
 
     def get_raw_user_info(self, token: str):
         headers = {"Authorization": f"token {token}"}
-        response = httpx.get(self._USER_INFO_URL, headers=headers)
+        response = self._client.get(self._USER_INFO_URL, headers=headers)
         response.raise_for_status()
         user_info = response.json()
 
-        email_response = httpx.get(self._EMAIL_INFO_URL, headers=headers)
+        email_response = self._client.get(self._EMAIL_INFO_URL, headers=headers)
         email_info = email_response.json()
         primary_email: dict = next((email for email in email_info if email["primary"] == True), {})
 
@@ -113,7 +127,7 @@ class CasdoorOAuth(OAuth):
             "redirect_uri": self.redirect_uri,
         }
         headers = {"Accept": "application/json"}
-        response = httpx.post(self._TOKEN_URL, data=data, headers=headers)
+        response = self._client.post(self._TOKEN_URL, data=data, headers=headers)
 
         response_json = response.json()
         access_token = response_json.get("access_token")
@@ -130,7 +144,7 @@ class CasdoorOAuth(OAuth):
         
         try:
             # Get basic user info
-            response = httpx.get(self._USER_INFO_URL, headers=headers)
+            response = self._client.get(self._USER_INFO_URL, headers=headers)
             response.raise_for_status()
             user_info = response.json()
             
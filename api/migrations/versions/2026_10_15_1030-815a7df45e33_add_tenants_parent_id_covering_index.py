@@ -0,0 +1,55 @@
+"""add covering index on tenants.parent_id for the workspace hierarchy
+
+Revision ID: 815a7df45e33
+Revises: 685454eafcaa
+Create Date: 2026-10-15 10:30:12.481203
+
+"""
+from alembic import op
+import models as models
+import sqlalchemy as sa
+
+
+def _is_pg(conn):
+    return conn.dialect.name == "postgresql"
+
+
+# revision identifiers, used by Alembic.
+revision = '815a7df45e33'
+down_revision = '685454eafcaa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    conn = op.get_bind()
+
+    if _is_pg(conn):
+        # `CREATE INDEX CONCURRENTLY` cannot run within a transaction, so use the `autocommit_block`
+        # context manager to wrap the index creation statement.
+        # Reference:
+        #
+        # - https://alembic.sqlalchemy.org/en/latest/api/runtime.html#alembic.runtime.migration.MigrationContext.autocommit_block
+        with op.get_context().autocommit_block():
+            # INCLUDE (id, name) lets the hierarchy CTE walk tenants with index-only scans
+            op.create_index(
+                'tenants_parent_id_covering_idx',
+                'tenants',
+                ['parent_id'],
+                unique=False,
+                postgresql_include=['id', 'name'],
+                postgresql_concurrently=True,
+            )
+        op.execute(sa.text('ANALYZE tenants'))
+    else:
+        op.create_index('tenants_parent_id_covering_idx', 'tenants', ['parent_id'], unique=False)
+
+
+def downgrade():
+    conn = op.get_bind()
+
+    if _is_pg(conn):
+        with op.get_context().autocommit_block():
+            op.drop_index('tenants_parent_id_covering_idx', table_name='tenants', postgresql_concurrently=True)
+    else:
+        op.drop_index('tenants_parent_id_covering_idx', table_name='tenants')
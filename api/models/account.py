@@ -235,7 +235,10 @@ class TenantStatus(enum.StrEnum):
 
 class Tenant(TypeBase):
     __tablename__ = "tenants"
-    __table_args__ = (sa.PrimaryKeyConstraint("id", name="tenant_pkey"),)
+    __table_args__ = (
+        sa.PrimaryKeyConstraint("id", name="tenant_pkey"),
+        sa.Index("tenants_parent_id_covering_idx", "parent_id", postgresql_include=["id", "name"]),
+    )
 
     id: Mapped[str] = mapped_column(
         StringUUID, insert_default=lambda: str(uuid4()), default_factory=lambda: str(uuid4()), init=False
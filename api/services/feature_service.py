@@ -1,5 +1,6 @@
 from enum import StrEnum
 
+from flask import g, has_request_context
 from pydantic import BaseModel, ConfigDict, Field
 
 from configs import dify_config
@@ -174,6 +175,18 @@ class SystemFeatureModel(BaseModel):
 class FeatureService:
     @classmethod
     def get_features(cls, tenant_id: str) -> FeatureModel:
+        # Memoized on g like get_system_features; billing and enterprise lookups are remote calls.
+        if not has_request_context():
+            return cls._build_features(tenant_id)
+
+        features_cache: dict[str, FeatureModel] = g.setdefault("_features_cache", {})
+        features = features_cache.get(tenant_id)
+        if features is None:
+            features = features_cache[tenant_id] = cls._build_features(tenant_id)
+        return features
+
+    @classmethod
+    def _build_features(cls, tenant_id: str) -> FeatureModel:
         features = FeatureModel()
 
         cls._fulfill_params_from_env(features)
@@ -200,6 +213,21 @@ class FeatureService:
 
     @classmethod
     def get_system_features(cls) -> SystemFeatureModel:
+        # Login and registration flows consult the system features several times per request,
+        # and with enterprise enabled each lookup is a remote call. The memo lives on g, so it lasts as long
+        # as the app context, which in production is a single request. Without a request context nothing is
+        # memoized, so long-lived app contexts (e.g. Celery workers) keep seeing configuration changes.
+        if not has_request_context():
+            return cls._build_system_features()
+
+        system_features: SystemFeatureModel | None = g.get("_system_features")
+        if system_features is None:
+            system_features = cls._build_system_features()
+            g._system_features = system_features
+        return system_features
+
+    @classmethod
+    def _build_system_features(cls) -> SystemFeatureModel:
         system_features = SystemFeatureModel()
 
         cls._fulfill_system_params_from_env(system_features)
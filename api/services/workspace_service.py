@@ -1,11 +1,36 @@
+from collections.abc import Sequence
+
 from flask_login import current_user
+from sqlalchemy import Row, String, bindparam, text
 
 from configs import dify_config
 from extensions.ext_database import db
 from models.account import Tenant, TenantAccountJoin, TenantAccountRole
-from services.account_service import TenantService
+from models.types import StringUUID
+from services.errors.account import MemberNotInTenantError
 from services.feature_service import FeatureService
 
+# 可以查看工作空间品牌配置的角色
+_PRIVILEGED_ROLES = frozenset({TenantAccountRole.OWNER, TenantAccountRole.ADMIN})
+
+# 工作空间层级的最大递归深度, 防止 parent_id 数据成环时无限递归
+_MAX_TENANT_TREE_DEPTH = 32
+
+# 工作空间层级查询: :root 为空时从所有根工作空间开始, 否则从指定工作空间开始
+_HIERARCHY_SQL = (
+    text(
+        "WITH RECURSIVE sub(id, name, parent_id, depth) AS ("
+        " SELECT id, name, parent_id, 0 FROM tenants"
+        " WHERE (:root IS NULL AND parent_id IS NULL) OR id = :root"
+        " UNION ALL"
+        " SELECT t.id, t.name, t.parent_id, sub.depth + 1 FROM tenants t JOIN sub ON t.parent_id = sub.id"
+        " WHERE sub.depth < :max_depth"
+        ") SELECT id, name, parent_id FROM sub ORDER BY depth LIMIT :limit"
+    )
+    .bindparams(bindparam("root", type_=StringUUID))
+    .columns(id=StringUUID, name=String, parent_id=StringUUID)
+)
+
 
 class WorkspaceService:
     @classmethod
@@ -23,24 +48,24 @@ class WorkspaceService:
         }
 
         # Get role of user
-        tenant_account_join = (
-            db.session.query(TenantAccountJoin)
+        role = (
+            db.session.query(TenantAccountJoin.role)
             .where(TenantAccountJoin.tenant_id == tenant.id, TenantAccountJoin.account_id == current_user.id)
-            .first()
+            .scalar()
         )
-        assert tenant_account_join is not None, "TenantAccountJoin not found"
-        tenant_info["role"] = tenant_account_join.role
+        if role is None:
+            raise MemberNotInTenantError("Member not in tenant.")
+        tenant_info["role"] = role
 
-        can_replace_logo = FeatureService.get_features(tenant.id).can_replace_logo
-
-        if can_replace_logo and TenantService.has_roles(tenant, [TenantAccountRole.OWNER, TenantAccountRole.ADMIN]):
-            base_url = dify_config.FILES_URL
+        # Only owners and admins see the branding config, so skip the feature lookup for everyone else
+        if role in _PRIVILEGED_ROLES and FeatureService.get_features(tenant.id).can_replace_logo:
+            custom_config = tenant.custom_config_dict
             replace_webapp_logo = (
-                f"{base_url}/files/workspaces/{tenant.id}/webapp-logo"
-                if tenant.custom_config_dict.get("replace_webapp_logo")
+                f"{dify_config.FILES_URL}/files/workspaces/{tenant.id}/webapp-logo"
+                if custom_config.get("replace_webapp_logo")
                 else None
             )
-            remove_webapp_brand = tenant.custom_config_dict.get("remove_webapp_brand", False)
+            remove_webapp_brand = custom_config.get("remove_webapp_brand", False)
 
             tenant_info["custom_config"] = {
                 "remove_webapp_brand": remove_webapp_brand,
@@ -52,52 +77,38 @@ class WorkspaceService:
     @classmethod
     def get_tenant_hierarchy(cls, tenant_id: str) -> dict:
         """获取工作空间层级结构"""
-        tenant = db.session.query(Tenant).filter_by(id=tenant_id).first()
-        if not tenant:
-            return {}
-        
-        # 递归获取子工作空间
-        def get_children(tenant_id: str) -> list:
-            children = db.session.query(Tenant).filter_by(parent_id=tenant_id).all()
-            result = []
-            for child in children:
-                result.append({
-                    "id": child.id,
-                    "name": child.name,
-                    "children": get_children(child.id)
-                })
-            return result
-        
-        return {
-            "id": tenant.id,
-            "name": tenant.name,
-            "children": get_children(tenant.id)
-        }
-    
+        nodes, _ = cls._link_nodes(cls._fetch_hierarchy(tenant_id))
+        return nodes.get(tenant_id, {})
+
     @classmethod
     def get_all_tenants_with_hierarchy(cls) -> list:
         """获取所有工作空间的层级结构"""
-        # 获取所有根工作空间
-        root_tenants = db.session.query(Tenant).filter_by(parent_id=None).all()
-        
-        result = []
-        for tenant in root_tenants:
-            # 递归获取子工作空间
-            def get_children(tenant_id: str) -> list:
-                children = db.session.query(Tenant).filter_by(parent_id=tenant_id).all()
-                child_list = []
-                for child in children:
-                    child_list.append({
-                        "id": child.id,
-                        "name": child.name,
-                        "children": get_children(child.id)
-                    })
-                return child_list
-            
-            result.append({
-                "id": tenant.id,
-                "name": tenant.name,
-                "children": get_children(tenant.id)
-            })
-        
-        return result
+        _, roots = cls._link_nodes(cls._fetch_hierarchy(None))
+        return roots
+
+    @classmethod
+    def _fetch_hierarchy(cls, root_id: str | None) -> Sequence[Row]:
+        """一次查询取出以 root_id 为根的子树, root_id 为空时取出所有根工作空间及其子树 (id, name, parent_id)"""
+        # depth 限制保证 parent_id 成环时递归也会终止; 多取一行用于判断是否超过节点上限
+        max_nodes = dify_config.MAX_TENANT_TREE_NODES
+        rows = db.session.execute(
+            _HIERARCHY_SQL, {"root": root_id, "max_depth": _MAX_TENANT_TREE_DEPTH, "limit": max_nodes + 1}
+        ).all()
+        if len(rows) > max_nodes:
+            raise ValueError(f"Workspace hierarchy exceeds {max_nodes} nodes.")
+        return rows
+
+    @staticmethod
+    def _link_nodes(rows: Sequence[Row]) -> tuple[dict[str, dict], list[dict]]:
+        """将按深度排序的 (id, name, parent_id) 行挂接成树, 返回 (id -> 节点, 根节点列表)"""
+        nodes: dict[str, dict] = {}
+        roots: list[dict] = []
+        for row in rows:
+            # parent_id 成环时同一工作空间会重复出现, 只保留第一次 (深度最小) 的位置
+            if row.id in nodes:
+                continue
+            node = nodes[row.id] = {"id": row.id, "name": row.name, "children": []}
+            # 父节点不在之前的结果中的即为根 (整体查询时 parent_id 为空, 子树查询时为起始工作空间)
+            parent = nodes.get(row.parent_id) if row.parent_id else None
+            (parent["children"] if parent else roots).append(node)
+        return nodes, roots
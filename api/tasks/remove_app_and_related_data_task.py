@@ -9,6 +9,7 @@ from sqlalchemy import delete
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import sessionmaker
 
+from core.helper.api_token_cache import ApiTokenCache
 from extensions.ext_database import db
 from models import (
     ApiToken,
@@ -126,7 +127,12 @@ def _delete_app_mcp_servers(tenant_id: str, app_id: str):
 
 def _delete_app_api_tokens(tenant_id: str, app_id: str):
     def del_api_token(api_token_id: str):
+        api_token = db.session.query(ApiToken).where(ApiToken.id == api_token_id).first()
         db.session.query(ApiToken).where(ApiToken.id == api_token_id).delete(synchronize_session=False)
+        # Commit before invalidating so a concurrent request cannot re-cache the deleted token
+        db.session.commit()
+        if api_token:
+            ApiTokenCache.delete(api_token.token, api_token.type)
 
     _delete_records(
         """select id from api_tokens where app_id=:app_id limit 1000""",
@@ -15,17 +15,14 @@ class TestWorkspaceService:
         """Mock setup for external service dependencies."""
         with (
             patch("services.workspace_service.FeatureService") as mock_feature_service,
-            patch("services.workspace_service.TenantService") as mock_tenant_service,
             patch("services.workspace_service.dify_config") as mock_dify_config,
         ):
             # Setup default mock returns
             mock_feature_service.get_features.return_value.can_replace_logo = True
-            mock_tenant_service.has_roles.return_value = True
             mock_dify_config.FILES_URL = "https://example.com/files"
 
             yield {
                 "feature_service": mock_feature_service,
-                "tenant_service": mock_tenant_service,
                 "dify_config": mock_dify_config,
             }
 
@@ -98,7 +95,6 @@ class TestWorkspaceService:
 
         # Setup mocks for feature service
         mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-        mock_external_service_dependencies["tenant_service"].has_roles.return_value = True
 
         # Mock current_user for flask_login
         with patch("services.workspace_service.current_user", account):
@@ -146,7 +142,6 @@ class TestWorkspaceService:
 
         # Setup mocks to disable custom config features
         mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = False
-        mock_external_service_dependencies["tenant_service"].has_roles.return_value = False
 
         # Mock current_user for flask_login
         with patch("services.workspace_service.current_user", account):
@@ -199,7 +194,6 @@ class TestWorkspaceService:
 
         # Setup mocks for feature service
         mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-        mock_external_service_dependencies["tenant_service"].has_roles.return_value = False
 
         # Mock current_user for flask_login
         with patch("services.workspace_service.current_user", account):
@@ -218,6 +212,7 @@ class TestWorkspaceService:
 
             # Verify custom config is not included for normal users
             assert "custom_config" not in result
+            mock_external_service_dependencies["feature_service"].get_features.assert_not_called()
 
             # Verify database state
             db.session.refresh(tenant)
@@ -248,9 +243,8 @@ class TestWorkspaceService:
         join.role = TenantAccountRole.ADMIN
         db.session.commit()
 
-        # Setup mocks for feature service and tenant service
+        # Setup mocks for feature service
         mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-        mock_external_service_dependencies["tenant_service"].has_roles.return_value = True
         mock_external_service_dependencies["dify_config"].FILES_URL = "https://cdn.example.com"
 
         # Mock current_user for flask_login
@@ -330,7 +324,6 @@ class TestWorkspaceService:
 
             # Setup mocks
             mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-            mock_external_service_dependencies["tenant_service"].has_roles.return_value = True
             mock_external_service_dependencies["dify_config"].FILES_URL = "https://files.example.com"
 
             # Mock current_user for flask_login
@@ -381,10 +374,8 @@ class TestWorkspaceService:
         join.role = TenantAccountRole.EDITOR
         db.session.commit()
 
-        # Setup mocks for feature service and tenant service
+        # Setup mocks for feature service
         mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-        # Editor role should not have admin/owner permissions
-        mock_external_service_dependencies["tenant_service"].has_roles.return_value = False
         mock_external_service_dependencies["dify_config"].FILES_URL = "https://cdn.example.com"
 
         # Mock current_user for flask_login
@@ -428,10 +419,8 @@ class TestWorkspaceService:
         join.role = TenantAccountRole.DATASET_OPERATOR
         db.session.commit()
 
-        # Setup mocks for feature service and tenant service
+        # Setup mocks for feature service
         mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-        # Dataset operator should not have admin/owner permissions
-        mock_external_service_dependencies["tenant_service"].has_roles.return_value = False
         mock_external_service_dependencies["dify_config"].FILES_URL = "https://cdn.example.com"
 
         # Mock current_user for flask_login
@@ -498,7 +487,6 @@ class TestWorkspaceService:
 
             # Setup mocks
             mock_external_service_dependencies["feature_service"].get_features.return_value.can_replace_logo = True
-            mock_external_service_dependencies["tenant_service"].has_roles.return_value = True
             mock_external_service_dependencies["dify_config"].FILES_URL = "https://files.example.com"
 
             # Mock current_user for flask_login
@@ -6,12 +6,15 @@ from flask import Flask
 from controllers.console.auth.oauth import (
     OAuthCallback,
     OAuthLogin,
+    _expand_org_paths,
     _generate_account,
     _get_account_by_openid_or_email,
+    _split_org_path,
+    _sync_user_organizations,
     get_oauth_providers,
 )
 from libs.oauth import OAuthUserInfo
-from models.account import AccountStatus
+from models.account import AccountStatus, CasdoorOrganizationMapping, Tenant, TenantAccountRole
 from services.errors.account import AccountRegisterError
 
 
@@ -22,6 +25,12 @@ class TestGetOAuthProviders:
         app.config["TESTING"] = True
         return app
 
+    @pytest.fixture(autouse=True)
+    def clear_provider_cache(self):
+        get_oauth_providers.cache_clear()
+        yield
+        get_oauth_providers.cache_clear()
+
     @pytest.mark.parametrize(
         ("github_config", "google_config", "expected_github", "expected_google"),
         [
@@ -56,6 +65,23 @@ class TestGetOAuthProviders:
         assert (providers["github"] is not None) == expected_github
         assert (providers["google"] is not None) == expected_google
 
+    @patch("controllers.console.auth.oauth.dify_config")
+    def test_should_build_providers_once(self, mock_config):
+        mock_config.GITHUB_CLIENT_ID = "github_id"
+        mock_config.GITHUB_CLIENT_SECRET = "github_secret"
+        mock_config.CASDOOR_CLIENT_ID = None
+        mock_config.CASDOOR_CLIENT_SECRET = None
+        mock_config.CONSOLE_API_URL = "http://localhost"
+
+        first = get_oauth_providers()
+        second = get_oauth_providers()
+
+        assert first is second
+        assert first["github"] is second["github"]
+
+        get_oauth_providers.cache_clear()
+        assert get_oauth_providers() is not first
+
 
 class TestOAuthLogin:
     @pytest.fixture
@@ -310,6 +336,7 @@ class TestOAuthCallback:
         assert mock_account.status == AccountStatus.ACTIVE
         assert mock_account.initialized_at is not None
         mock_db.session.commit.assert_called_once()
+        mock_account_service.login.assert_called_once()
 
     @patch("controllers.console.auth.oauth.dify_config")
     @patch("controllers.console.auth.oauth.get_oauth_providers")
@@ -395,30 +422,18 @@ class TestAccountGeneration:
         account.name = "Test User"
         return account
 
+    @pytest.mark.parametrize("found", [True, False])
     @patch("controllers.console.auth.oauth.db")
-    @patch("controllers.console.auth.oauth.Account")
-    @patch("controllers.console.auth.oauth.Session")
-    @patch("controllers.console.auth.oauth.select")
-    def test_should_get_account_by_openid_or_email(
-        self, mock_select, mock_session, mock_account_model, mock_db, user_info, mock_account
-    ):
-        # Mock db.engine for Session creation
-        mock_db.engine = MagicMock()
+    def test_should_get_account_by_openid_or_email(self, mock_db, user_info, mock_account, found):
+        mock_db.session.execute.return_value.scalar_one_or_none.return_value = mock_account if found else None
 
-        # Test OpenID found
-        mock_account_model.get_by_openid.return_value = mock_account
         result = _get_account_by_openid_or_email("github", user_info)
-        assert result == mock_account
-        mock_account_model.get_by_openid.assert_called_once_with("github", "123")
 
-        # Test fallback to email
-        mock_account_model.get_by_openid.return_value = None
-        mock_session_instance = MagicMock()
-        mock_session_instance.execute.return_value.scalar_one_or_none.return_value = mock_account
-        mock_session.return_value.__enter__.return_value = mock_session_instance
-
-        result = _get_account_by_openid_or_email("github", user_info)
-        assert result == mock_account
+        assert result == (mock_account if found else None)
+        mock_db.session.execute.assert_called_once()
+        compiled = str(mock_db.session.execute.call_args.args[0])
+        assert "account_integrates" in compiled
+        assert "accounts.email" in compiled
 
     @pytest.mark.parametrize(
         ("allow_register", "existing_account", "should_create"),
@@ -463,8 +478,16 @@ class TestAccountGeneration:
 
                 if should_create:
                     mock_register_service.register.assert_called_once_with(
-                        email="test@example.com", name="Test User", password=None, open_id="123", provider="github"
+                        email="test@example.com",
+                        name="Test User",
+                        password=None,
+                        open_id="123",
+                        provider="github",
+                        language="en-US",
                     )
+                    mock_account_service.link_account_integrate.assert_not_called()
+                else:
+                    mock_account_service.link_account_integrate.assert_called_once_with("github", "123", mock_account)
 
     @patch("controllers.console.auth.oauth._get_account_by_openid_or_email")
     @patch("controllers.console.auth.oauth.TenantService")
@@ -498,3 +521,145 @@ class TestAccountGeneration:
                 mock_new_tenant, mock_account, role="owner"
             )
             mock_event.send.assert_called_once_with(mock_new_tenant)
+
+    @pytest.mark.parametrize(
+        ("organizations", "should_sync"),
+        [
+            ([], False),
+            (["Yrec/eng-backend"], True),
+        ],
+    )
+    @patch("controllers.console.auth.oauth._sync_user_organizations")
+    @patch("controllers.console.auth.oauth._get_account_by_openid_or_email")
+    @patch("controllers.console.auth.oauth.TenantService")
+    @patch("controllers.console.auth.oauth.AccountService")
+    def test_should_only_sync_organizations_when_present(
+        self,
+        mock_account_service,
+        mock_tenant_service,
+        mock_get_account,
+        mock_sync,
+        app,
+        mock_account,
+        organizations,
+        should_sync,
+    ):
+        mock_get_account.return_value = mock_account
+        mock_tenant_service.get_join_tenants.return_value = [MagicMock()]
+        user_info = OAuthUserInfo(id="123", name="Test User", email="test@example.com", organizations=organizations)
+
+        with app.test_request_context(headers={"Accept-Language": "en-US,en;q=0.9"}):
+            _generate_account("casdoor", user_info)
+
+        if should_sync:
+            mock_sync.assert_called_once_with(mock_account, user_info)
+        else:
+            mock_sync.assert_not_called()
+
+
+class TestSyncUserOrganizations:
+    @pytest.fixture
+    def mock_account(self):
+        account = MagicMock()
+        account.id = "account-1"
+        account.current_tenant = None
+        return account
+
+    @pytest.fixture
+    def mock_db(self):
+        with patch("controllers.console.auth.oauth.db") as mock_db:
+            yield mock_db
+
+    @pytest.fixture(autouse=True)
+    def mock_tenant_service(self):
+        with patch("controllers.console.auth.oauth.TenantService") as mock_tenant_service:
+            mock_tenant_service.get_join_tenants.return_value = []
+            yield mock_tenant_service
+
+    @pytest.fixture(autouse=True)
+    def mock_config(self):
+        with patch("controllers.console.auth.oauth.dify_config") as mock_config:
+            mock_config.BILLING_ENABLED = False
+            yield mock_config
+
+    @staticmethod
+    def _inserted_memberships(mock_db) -> list[dict]:
+        # The first execute loads the org mappings; any further call is the membership bulk insert
+        insert_calls = mock_db.session.execute.call_args_list[1:]
+        return [row for call in insert_calls for row in call.args[1]]
+
+    def test_should_create_tenants_and_memberships_for_new_orgs(self, mock_db, mock_account):
+        mock_db.session.scalars.return_value = []
+        mock_db.session.execute.return_value.all.return_value = []
+        user_info = OAuthUserInfo(id="123", name="Test User", email="test@example.com", organizations=["Yrec/eng"])
+
+        _sync_user_organizations(mock_account, user_info)
+
+        new_tenants = mock_db.session.add_all.call_args_list[0].args[0]
+        parent, child = new_tenants
+        assert (parent.name, parent.parent_id) == ("Yrec", None)
+        assert (child.name, child.parent_id) == ("eng", parent.id)
+        assert self._inserted_memberships(mock_db) == [
+            {"tenant_id": parent.id, "account_id": "account-1", "role": TenantAccountRole.ADMIN},
+            {"tenant_id": child.id, "account_id": "account-1", "role": TenantAccountRole.ADMIN},
+        ]
+        mock_db.session.commit.assert_called_once()
+        assert mock_account.current_tenant is parent
+
+    def test_should_skip_existing_memberships_regardless_of_tenant_status(
+        self, mock_db, mock_account, mock_tenant_service
+    ):
+        # The user already joined the archived "Yrec" tenant, which get_join_tenants does not return
+        archived = Tenant(name="Yrec", casdoor_org_id="Yrec", status="archive")
+        mapping = CasdoorOrganizationMapping(casdoor_org_id="Yrec", tenant_id=archived.id)
+        mock_db.session.scalars.return_value = [archived.id]
+        mock_db.session.execute.return_value.all.return_value = [(mapping, archived)]
+        user_info = OAuthUserInfo(id="123", name="Test User", email="test@example.com", organizations=["Yrec/eng"])
+
+        _sync_user_organizations(mock_account, user_info)
+
+        (child,) = mock_db.session.add_all.call_args_list[0].args[0]
+        assert child.parent_id == archived.id
+        assert self._inserted_memberships(mock_db) == [
+            {"tenant_id": child.id, "account_id": "account-1", "role": TenantAccountRole.ADMIN},
+        ]
+
+    def test_should_not_insert_when_all_memberships_exist(self, mock_db, mock_account, mock_tenant_service):
+        tenant = Tenant(name="Yrec", casdoor_org_id="Yrec")
+        mapping = CasdoorOrganizationMapping(casdoor_org_id="Yrec", tenant_id=tenant.id)
+        mock_tenant_service.get_join_tenants.return_value = [tenant]
+        mock_db.session.scalars.return_value = [tenant.id]
+        mock_db.session.execute.return_value.all.return_value = [(mapping, tenant)]
+        user_info = OAuthUserInfo(id="123", name="Test User", email="test@example.com", organizations=["Yrec"])
+
+        _sync_user_organizations(mock_account, user_info)
+
+        mock_db.session.add_all.assert_not_called()
+        assert self._inserted_memberships(mock_db) == []
+        assert mock_account.current_tenant is tenant
+
+
+class TestOrganizationPaths:
+    def test_should_expand_and_dedupe_org_paths_parents_first(self):
+        organizations = ["Yrec/eng-backend-v2", "Yrec/eng-frontend", "Yrec/ops", "Solo", None, {"name": "ignored"}]
+
+        assert _expand_org_paths(organizations) == [
+            "Yrec",
+            "Yrec/eng",
+            "Yrec/eng-backend",
+            "Yrec/eng-backend-v2",
+            "Yrec/eng-frontend",
+            "Yrec/ops",
+            "Solo",
+        ]
+
+    @pytest.mark.parametrize(
+        ("org_path", "expected"),
+        [
+            ("Solo", ("Solo", None)),
+            ("Yrec/eng", ("eng", "Yrec")),
+            ("Yrec/eng-backend-v2", ("v2", "Yrec/eng-backend")),
+        ],
+    )
+    def test_should_split_org_path_into_name_and_parent(self, org_path, expected):
+        assert _split_org_path(org_path) == expected
@@ -0,0 +1,70 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from redis.exceptions import RedisError
+
+from core.helper.api_token_cache import ApiTokenCache
+
+
+@pytest.fixture
+def mock_redis_client():
+    """Fixture: Mock Redis client"""
+    with patch("core.helper.api_token_cache.redis_client") as mock:
+        yield mock
+
+
+class TestApiTokenCache:
+    """Test class for ApiTokenCache"""
+
+    def test_generate_cache_key_hashes_token(self):
+        """Test cache key is scoped and does not contain the raw token"""
+        key = ApiTokenCache._generate_cache_key("app-secret-token", "app")
+
+        assert key.startswith("api_token:app:")
+        assert "app-secret-token" not in key
+        assert key != ApiTokenCache._generate_cache_key("app-secret-token", "dataset")
+
+    def test_get_hit(self, mock_redis_client):
+        """Test get cached token - cache hit"""
+        data = {"id": "token_id", "app_id": "app_id", "tenant_id": "tenant_id", "type": "app"}
+        mock_redis_client.get.return_value = json.dumps(data).encode("utf-8")
+
+        result = ApiTokenCache.get("app-token", "app")
+
+        mock_redis_client.get.assert_called_once_with(ApiTokenCache._generate_cache_key("app-token", "app"))
+        assert result == data
+
+    def test_get_miss(self, mock_redis_client):
+        """Test get cached token - cache miss"""
+        mock_redis_client.get.return_value = None
+
+        assert ApiTokenCache.get("app-token", "app") is None
+
+    def test_get_decode_error(self, mock_redis_client):
+        """Test get cached token - cache hit but decoding failed"""
+        mock_redis_client.get.return_value = b"invalid_json_data"
+
+        assert ApiTokenCache.get("app-token", "app") is None
+
+    def test_set(self, mock_redis_client):
+        """Test set cached token uses the short TTL"""
+        data = {"id": "token_id", "app_id": None, "tenant_id": "tenant_id", "type": "dataset"}
+
+        ApiTokenCache.set("ds-token", "dataset", data)
+
+        mock_redis_client.setex.assert_called_once_with(
+            ApiTokenCache._generate_cache_key("ds-token", "dataset"), ApiTokenCache.CACHE_TTL, json.dumps(data)
+        )
+
+    def test_delete(self, mock_redis_client):
+        """Test invalidate cached token"""
+        ApiTokenCache.delete("app-token", "app")
+
+        mock_redis_client.delete.assert_called_once_with(ApiTokenCache._generate_cache_key("app-token", "app"))
+
+    def test_redis_fallback(self, mock_redis_client):
+        """Test Redis errors fall back to a cache miss"""
+        mock_redis_client.get.side_effect = RedisError("Redis connection error")
+
+        assert ApiTokenCache.get("app-token", "app") is None
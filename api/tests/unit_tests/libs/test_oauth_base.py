@@ -1,6 +1,8 @@
+from unittest.mock import MagicMock, patch
+
 import pytest
 
-from libs.oauth import OAuth
+from libs.oauth import CasdoorOAuth, GitHubOAuth, OAuth, _build_oauth_client
 
 
 def test_oauth_base_methods_raise_not_implemented():
@@ -17,3 +19,57 @@ def test_oauth_base_methods_raise_not_implemented():
 
     with pytest.raises(NotImplementedError):
         oauth._transform_user_info({})
+
+
+def test_oauth_providers_share_one_pooled_client_per_provider():
+    github = GitHubOAuth(client_id="id", client_secret="sec", redirect_uri="uri")
+    other_github = GitHubOAuth(client_id="other", client_secret="sec", redirect_uri="uri")
+    casdoor = CasdoorOAuth(client_id="id", client_secret="sec", redirect_uri="uri")
+
+    assert github._client is other_github._client
+    assert github._client is not casdoor._client
+
+
+@patch("libs.oauth.get_pooled_http_client")
+def test_github_oauth_requests_use_pooled_client(mock_get_client):
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.post.return_value.json.return_value = {"access_token": "token"}
+    user_response = MagicMock()
+    user_response.json.return_value = {"id": 1, "login": "user", "name": "User"}
+    email_response = MagicMock()
+    email_response.json.return_value = [{"email": "user@example.com", "primary": True}]
+    mock_client.get.side_effect = [user_response, email_response]
+
+    oauth = GitHubOAuth(client_id="id", client_secret="sec", redirect_uri="uri")
+
+    assert oauth.get_access_token("code") == "token"
+    assert oauth.get_raw_user_info("token")["email"] == "user@example.com"
+
+    mock_client.post.assert_called_once()
+    assert mock_client.get.call_count == 2
+    assert mock_get_client.call_count == 3
+    for call in mock_get_client.call_args_list:
+        assert call.args == ("oauth:GitHubOAuth", _build_oauth_client)
+
+
+@patch("libs.oauth.get_pooled_http_client")
+def test_casdoor_oauth_requests_use_pooled_client(mock_get_client):
+    mock_client = MagicMock()
+    mock_get_client.return_value = mock_client
+    mock_client.post.return_value.json.return_value = {"access_token": "token"}
+    mock_client.get.return_value.json.return_value = {
+        "status": "ok",
+        "data": {"id": "user-1", "name": "User", "email": "user@example.com", "groups": ["org/team"]},
+    }
+
+    oauth = CasdoorOAuth(client_id="id", client_secret="sec", redirect_uri="uri")
+
+    assert oauth.get_access_token("code") == "token"
+    assert oauth.get_raw_user_info("token")["organizations"] == ["org/team"]
+
+    mock_client.post.assert_called_once()
+    mock_client.get.assert_called_once()
+    assert mock_get_client.call_count == 2
+    for call in mock_get_client.call_args_list:
+        assert call.args == ("oauth:CasdoorOAuth", _build_oauth_client)
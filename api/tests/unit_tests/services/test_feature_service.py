@@ -0,0 +1,59 @@
+from unittest.mock import patch
+
+from flask import Flask
+
+from services.feature_service import FeatureModel, FeatureService, SystemFeatureModel
+
+
+class TestGetSystemFeatures:
+    """Test per-request memoization of FeatureService.get_system_features"""
+
+    def test_memoized_within_request(self, app: Flask):
+        """Test system features are built once per request"""
+        with patch.object(
+            FeatureService, "_build_system_features", side_effect=lambda: SystemFeatureModel()
+        ) as mock_build:
+            with app.app_context(), app.test_request_context():
+                first = FeatureService.get_system_features()
+                second = FeatureService.get_system_features()
+
+                assert first is second
+                mock_build.assert_called_once()
+
+            with app.app_context(), app.test_request_context():
+                assert FeatureService.get_system_features() is not first
+
+    def test_not_memoized_outside_request(self):
+        """Test system features are rebuilt when no request is active"""
+        with patch.object(
+            FeatureService, "_build_system_features", side_effect=lambda: SystemFeatureModel()
+        ) as mock_build:
+            first = FeatureService.get_system_features()
+            second = FeatureService.get_system_features()
+
+            assert first is not second
+            assert mock_build.call_count == 2
+
+
+class TestGetFeatures:
+    """Test per-request memoization of FeatureService.get_features"""
+
+    def test_memoized_per_tenant_within_request(self, app: Flask):
+        """Test features are built once per tenant per request"""
+        with patch.object(
+            FeatureService, "_build_features", side_effect=lambda tenant_id: FeatureModel()
+        ) as mock_build:
+            with app.app_context(), app.test_request_context():
+                first = FeatureService.get_features("tenant-1")
+
+                assert FeatureService.get_features("tenant-1") is first
+                assert FeatureService.get_features("tenant-2") is not first
+                assert mock_build.call_count == 2
+
+    def test_not_memoized_outside_request(self):
+        """Test features are rebuilt when no request is active"""
+        with patch.object(
+            FeatureService, "_build_features", side_effect=lambda tenant_id: FeatureModel()
+        ) as mock_build:
+            assert FeatureService.get_features("tenant-1") is not FeatureService.get_features("tenant-1")
+            assert mock_build.call_count == 2
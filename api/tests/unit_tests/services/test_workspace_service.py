@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from services.workspace_service import WorkspaceService
+
+
+def _row(id: str, name: str, parent_id: str | None = None):
+    return SimpleNamespace(id=id, name=name, parent_id=parent_id)
+
+
+class TestTenantHierarchy:
+    """Test building workspace hierarchies from flat tenant rows"""
+
+    def test_get_tenant_hierarchy(self):
+        """Test subtree rows are nested under the requested tenant"""
+        rows = [
+            _row("root", "Root", "outer"),
+            _row("a", "A", "root"),
+            _row("b", "B", "root"),
+            _row("a1", "A1", "a"),
+        ]
+        with patch.object(WorkspaceService, "_fetch_hierarchy", return_value=rows) as mock_fetch:
+            result = WorkspaceService.get_tenant_hierarchy("root")
+
+        mock_fetch.assert_called_once_with("root")
+        assert result == {
+            "id": "root",
+            "name": "Root",
+            "children": [
+                {"id": "a", "name": "A", "children": [{"id": "a1", "name": "A1", "children": []}]},
+                {"id": "b", "name": "B", "children": []},
+            ],
+        }
+
+    def test_get_tenant_hierarchy_not_found(self):
+        """Test an unknown tenant yields an empty hierarchy"""
+        with patch.object(WorkspaceService, "_fetch_hierarchy", return_value=[]):
+            assert WorkspaceService.get_tenant_hierarchy("missing") == {}
+
+    def test_get_all_tenants_with_hierarchy(self):
+        """Test every root tenant gets its own tree from a single fetch"""
+        rows = [
+            _row("r1", "R1"),
+            _row("r2", "R2"),
+            _row("c1", "C1", "r1"),
+        ]
+        with patch.object(WorkspaceService, "_fetch_hierarchy", return_value=rows) as mock_fetch:
+            result = WorkspaceService.get_all_tenants_with_hierarchy()
+
+        mock_fetch.assert_called_once_with(None)
+        assert result == [
+            {"id": "r1", "name": "R1", "children": [{"id": "c1", "name": "C1", "children": []}]},
+            {"id": "r2", "name": "R2", "children": []},
+        ]
+
+    def test_get_tenant_hierarchy_breaks_parent_cycles(self):
+        """Test a parent_id cycle does not link the requested tenant back under its descendants"""
+        rows = [
+            _row("root", "Root", "a"),
+            _row("a", "A", "root"),
+            _row("root", "Root", "a"),
+            _row("a", "A", "root"),
+        ]
+        with patch.object(WorkspaceService, "_fetch_hierarchy", return_value=rows):
+            result = WorkspaceService.get_tenant_hierarchy("root")
+
+        assert result == {
+            "id": "root",
+            "name": "Root",
+            "children": [{"id": "a", "name": "A", "children": []}],
+        }
+
+    def test_hierarchy_node_limit(self):
+        """Test hierarchies larger than MAX_TENANT_TREE_NODES are rejected"""
+        rows = [_row("r1", "R1"), _row("c1", "C1", "r1"), _row("c2", "C2", "r1")]
+        with (
+            patch("services.workspace_service.db") as mock_db,
+            patch("services.workspace_service.dify_config") as mock_config,
+        ):
+            mock_config.MAX_TENANT_TREE_NODES = 2
+            mock_db.session.execute.return_value.all.return_value = rows
+
+            with pytest.raises(ValueError, match="exceeds 2 nodes"):
+                WorkspaceService.get_all_tenants_with_hierarchy()
+
+        params = mock_db.session.execute.call_args.args[1]
+        assert params["limit"] == 3